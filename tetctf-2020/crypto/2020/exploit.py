@@ -12,30 +12,45 @@ We can use Z3 to solve for the seed given known outputs.
 from z3 import *
 import random
 
+from mt_untemper import temper, untemper
+
 class MT19937:
     """Python's MT19937 implementation for symbolic execution"""
     def __init__(self, seed):
+        # random.seed(seed) for 0 <= seed < 2**32: init_by_array([seed]),
+        # which starts from init_genrand(19650218)
         self.mt = [0] * 624
         self.index = 624
-        self.mt[0] = seed
+        self.mt[0] = 19650218
         for i in range(1, 624):
             self.mt[i] = (0xFFFFFFFF & (1812433253 * (self.mt[i-1] ^ (self.mt[i-1] >> 30)) + i))
 
+        i = 1
+        for _ in range(624):
+            self.mt[i] = 0xFFFFFFFF & ((self.mt[i] ^ ((self.mt[i-1] ^ (self.mt[i-1] >> 30)) * 1664525)) + seed)
+            i += 1
+            if i >= 624:
+                self.mt[0] = self.mt[623]
+                i = 1
+        for _ in range(623):
+            self.mt[i] = 0xFFFFFFFF & ((self.mt[i] ^ ((self.mt[i-1] ^ (self.mt[i-1] >> 30)) * 1566083941)) - i)
+            i += 1
+            if i >= 624:
+                self.mt[0] = self.mt[623]
+                i = 1
+        self.mt[0] = 0x80000000
+
     def extract_number(self):
         if self.index >= 624:
             self.twist()
 
-        y = self.mt[self.index]
-        y = y ^ (y >> 11)
-        y = y ^ ((y << 7) & 0x9D2C5680)
-        y = y ^ ((y << 15) & 0xEFC60000)
-        y = y ^ (y >> 18)
-
+        y = temper(self.mt[self.index])
         self.index += 1
-        return 0xFFFFFFFF & y
+        return y
 
-    def twist(self):
-        for i in range(624):
+    def twist(self, start=0, stop=624):
+        """Twist words [start, stop) in place; a prefix twist gives the same words as a full one"""
+        for i in range(start, stop):
             y = (self.mt[i] & 0x80000000) + (self.mt[(i+1) % 624] & 0x7fffffff)
             self.mt[i] = self.mt[(i + 397) % 624] ^ (y >> 1)
             if y % 2 != 0:
@@ -43,31 +58,46 @@ class MT19937:
         self.index = 0
 
 def solve_seed(idx1, idx2, val1, val2):
-    """Use Z3 to solve for seed given two outputs at specific indices"""
+    """Brute force the seed with the pure-Python MT19937 given two outputs at specific indices"""
     print(f"[*] Solving for seed with outputs: {val1} at index {idx1}, {val2} at index {idx2}")
 
+    # Outputs of the first block are tempered state words: untemper the two
+    # targets once and compare raw words, no tempering per candidate. Only
+    # words up to the lower index are twisted before the first comparison,
+    # and up to the higher one for the seeds that pass it
+    (lo, val_lo), (hi, val_hi) = sorted([(idx1, val1), (idx2, val2)])
+    raw = None
+    if hi < 624:
+        raw = untemper(val_lo), untemper(val_hi)
+
     # For smaller search space, we can brute force the seed
     # Python typically uses time-based seeds which are 32-bit or less
-    for seed_candidate in range(0, 2**32):
-        if seed_candidate % 10000000 == 0:
-            print(f"[*] Trying seed: {seed_candidate}")
-
-        rng = MT19937(seed_candidate)
-
-        # Extract numbers up to our indices
-        match = True
-        for i in range(max(idx1, idx2) + 1):
-            val = rng.extract_number()
-            if i == idx1 and val != val1:
-                match = False
-                break
-            if i == idx2 and val != val2:
-                match = False
-                break
-
-        if match:
-            print(f"[+] Found seed: {seed_candidate}")
-            return seed_candidate
+    for base in range(0, 2**32, 10000000):
+        print(f"[*] Trying seed: {base}")
+        for seed_candidate in range(base, min(base + 10000000, 2**32)):
+            rng = MT19937(seed_candidate)
+
+            if raw is not None:
+                rng.twist(0, lo + 1)
+                if rng.mt[lo] != raw[0]:
+                    continue
+                rng.twist(lo + 1, hi + 1)
+                match = rng.mt[hi] == raw[1]
+            else:
+                # Extract numbers up to our indices
+                match = True
+                for i in range(hi + 1):
+                    val = rng.extract_number()
+                    if i == lo and val != val_lo:
+                        match = False
+                        break
+                    if i == hi and val != val_hi:
+                        match = False
+                        break
+
+            if match:
+                print(f"[+] Found seed: {seed_candidate}")
+                return seed_candidate
 
     return None
 
@@ -103,10 +133,13 @@ def main():
     seed = solve_seed(idx1, idx2, val1, val2)
 
     if seed is not None:
-        # Predict the 2020th number
+        # Predict the 2020th number: output 2019 is word r of block q
+        # (q + 1 twists), so no per-output extraction loop
+        q, r = divmod(2019, 624)
         rng = MT19937(seed)
-        for i in range(2020):
-            prediction = rng.extract_number()
+        for _ in range(q + 1):
+            rng.twist()
+        prediction = temper(rng.mt[r])
 
         print(f"[+] Predicted 2020th number: {prediction}")
         # io.sendline(str(prediction).encode())
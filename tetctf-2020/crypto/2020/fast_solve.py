@@ -1,23 +1,42 @@
 #!/usr/bin/env python3
 """
-Fast solver using optimized C-style brute force with Numba JIT compilation
-If numba not available, falls back to pure Python with optimizations
+Fast solver using optimized C-style brute force
+Prefers a Numba CUDA kernel when a GPU is available, then the C kernel in
+mt_scan.c (AVX2 + OpenMP, compiled once through cffi), then Numba JIT,
+then vectorized NumPy batches (one uint32 lane per seed)
+Without any of them, falls back to the C-implemented random module, one seed at a time
 """
 
+import hashlib
+import importlib.machinery
+import importlib.util
+import os
 import socket
+import sys
 import random
 
+from mt_untemper import matches_two_stage, untemper
+
 # Try to use numba for JIT compilation (much faster)
 try:
-    from numba import jit
+    from numba import njit, prange
     HAS_NUMBA = True
 except ImportError:
     HAS_NUMBA = False
-    # Fallback: no-op decorator
-    def jit(*args, **kwargs):
-        def decorator(func):
-            return func
-        return decorator
+
+# Numba's CUDA target for the GPU scan (NUMBA_ENABLE_CUDASIM=1 runs it on the CPU simulator)
+try:
+    from numba import cuda
+    HAS_CUDA = cuda.is_available()
+except Exception:
+    HAS_CUDA = False
+
+# Try to use numpy for the batched seed kernel
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # MT19937 constants
 N = 624
@@ -26,7 +45,13 @@ MATRIX_A = 0x9908b0df
 UPPER_MASK = 0x80000000
 LOWER_MASK = 0x7fffffff
 
-@jit(nopython=HAS_NUMBA)
+# Seeds tested per vectorized batch
+BATCH = 1 << 16
+
+# Seeds seeded side by side in the Numba kernel's (N, LANES) state block;
+# measured 0.35 us/seed at 128 against 0.52 at 32 and ~4.8 one seed at a time
+LANES = 128
+
 def init_genrand(seed):
     """Initialize MT19937 state"""
     mt = [0] * N
@@ -35,56 +60,461 @@ def init_genrand(seed):
         mt[mti] = (1812433253 * (mt[mti-1] ^ (mt[mti-1] >> 30)) + mti) & 0xffffffff
     return mt
 
-@jit(nopython=HAS_NUMBA)
-def genrand_int32(mt, index):
-    """Generate one random number from MT state"""
-    if index >= N:
-        # twist
-        for kk in range(N - M):
-            y = (mt[kk] & UPPER_MASK) | (mt[kk+1] & LOWER_MASK)
-            mt[kk] = mt[kk+M] ^ (y >> 1) ^ (MATRIX_A if y & 1 else 0)
-        for kk in range(N - M, N - 1):
-            y = (mt[kk] & UPPER_MASK) | (mt[kk+1] & LOWER_MASK)
-            mt[kk] = mt[kk+(M-N)] ^ (y >> 1) ^ (MATRIX_A if y & 1 else 0)
-        y = (mt[N-1] & UPPER_MASK) | (mt[0] & LOWER_MASK)
-        mt[N-1] = mt[M-1] ^ (y >> 1) ^ (MATRIX_A if y & 1 else 0)
-        index = 0
-
-    y = mt[index]
-    y ^= (y >> 11)
-    y ^= ((y << 7) & 0x9d2c5680)
-    y ^= ((y << 15) & 0xefc60000)
-    y ^= (y >> 18)
-
-    return y & 0xffffffff, index + 1
-
-def check_seed_fast(seed, idx1, idx2, val1, val2):
-    """Fast check if seed produces expected values"""
-    mt = init_genrand(seed)
-    index = N
-
-    for i in range(max(idx1, idx2) + 1):
-        r, index = genrand_int32(mt, index)
-        if i == idx1 and r != val1:
-            return False
-        if i == idx2 and r != val2:
-            return False
-    return True
-
-def brute_force_optimized(idx1, idx2, val1, val2, start=0, end=2**32):
-    """Optimized brute force"""
+if HAS_NUMPY:
+    _U32 = np.uint32
+    _INIT_19650218 = np.array(init_genrand(19650218), dtype=np.uint32)
+
+if HAS_NUMBA:
+    @njit(cache=True, boundscheck=False)
+    def _seed_state(mt, seed):
+        """Fill mt (uint32[N]) exactly like CPython's random.seed(seed) for 0 <= seed < 2**32
+
+        random.seed() goes through init_by_array() with the single key word
+        [seed], not through init_genrand(seed). Arithmetic is done in int64
+        and masked, which keeps numba from promoting to float.
+        """
+        mt[:] = _INIT_19650218
+        i = 1
+        for _ in range(N):
+            p = np.int64(mt[i-1])
+            mt[i] = ((np.int64(mt[i]) ^ ((p ^ (p >> 30)) * 1664525)) + seed) & 0xffffffff
+            i += 1
+            if i >= N:
+                mt[0] = mt[N-1]
+                i = 1
+        for _ in range(N - 1):
+            p = np.int64(mt[i-1])
+            mt[i] = ((np.int64(mt[i]) ^ ((p ^ (p >> 30)) * 1566083941)) - i) & 0xffffffff
+            i += 1
+            if i >= N:
+                mt[0] = mt[N-1]
+                i = 1
+        mt[0] = UPPER_MASK
+
+    @njit(cache=True, boundscheck=False)
+    def _twist_range(mt, start, stop):
+        """Twist words [start, stop) in place; a twisted prefix equals a full twist's prefix"""
+        for kk in range(start, stop):
+            y = (np.int64(mt[kk]) & UPPER_MASK) | (np.int64(mt[(kk+1) % N]) & LOWER_MASK)
+            # branchless: y & 1 is a coin flip per seed, so a branch here mispredicts
+            mt[kk] = np.int64(mt[(kk+M) % N]) ^ (y >> 1) ^ (-(y & 1) & MATRIX_A)
+
+    @njit(cache=True, boundscheck=False)
+    def _seed_lanes(S, base):
+        """_seed_state for seeds base .. base + LANES - 1 at once, into S (uint32[N, LANES])
+
+        Word-major (SoA): each recurrence step updates one contiguous row of
+        LANES independent seeds, which LLVM vectorizes. Plain uint32
+        arithmetic wraps by itself, so nothing is widened or masked.
+        """
+        u32 = np.uint32
+        for w in range(N):
+            v = _INIT_19650218[w]
+            for l in range(LANES):
+                S[w, l] = v
+        i = 1
+        for _ in range(N):
+            for l in range(LANES):
+                p = S[i-1, l]
+                S[i, l] = (S[i, l] ^ ((p ^ (p >> u32(30))) * u32(1664525))) + u32(base + l)
+            i += 1
+            if i >= N:
+                for l in range(LANES):
+                    S[0, l] = S[N-1, l]
+                i = 1
+        for _ in range(N - 1):
+            for l in range(LANES):
+                p = S[i-1, l]
+                S[i, l] = (S[i, l] ^ ((p ^ (p >> u32(30))) * u32(1566083941))) - u32(i)
+            i += 1
+            if i >= N:
+                for l in range(LANES):
+                    S[0, l] = S[N-1, l]
+                i = 1
+        for l in range(LANES):
+            S[0, l] = UPPER_MASK
+
+    @njit(cache=True, boundscheck=False)
+    def _check_seed(mt, seed, lo, raw_lo, hi, raw_hi):
+        """Scalar recheck of one seed against both twisted words"""
+        _seed_state(mt, seed)
+        _twist_range(mt, 0, hi + 1)
+        return mt[lo] == raw_lo and mt[hi] == raw_hi
+
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def brute_chunk(base, limit, lo, raw_lo, hi, raw_hi):
+        """Return the smallest seed in [base, limit) whose twisted words lo, hi equal raw_lo, raw_hi, or -1
+
+        Targets are untempered outputs, so no candidate is tempered. Requires
+        lo <= hi < N. Each prange shard stops at its first hit. For lo < N - M
+        word lo only reads untwisted words, so it is computed straight from
+        LANES freshly seeded states at a time and only matching lanes are
+        rechecked; other lo values go seed by seed with a prefix twist.
+        """
+        nshards = 64
+        span = (limit - base + nshards - 1) // nshards
+        best = limit
+        u32 = np.uint32
+        for t in prange(nshards):
+            start = base + t * span
+            stop = min(start + span, limit)
+            mt = np.empty(N, dtype=np.uint32)
+            if lo < N - M:
+                S = np.empty((N, LANES), dtype=np.uint32)
+                found = False
+                for blk in range(start, stop, LANES):
+                    _seed_lanes(S, blk)
+                    for l in range(min(LANES, stop - blk)):
+                        y = (S[lo, l] & u32(UPPER_MASK)) | (S[lo+1, l] & u32(LOWER_MASK))
+                        word = S[lo+M, l] ^ (y >> u32(1)) ^ ((u32(0) - (y & u32(1))) & u32(MATRIX_A))
+                        if word == raw_lo and _check_seed(mt, blk + l, lo, raw_lo, hi, raw_hi):
+                            best = min(best, blk + l)
+                            found = True
+                            break
+                    if found:
+                        break
+            else:
+                for seed in range(start, stop):
+                    _seed_state(mt, seed)
+                    _twist_range(mt, 0, lo + 1)
+                    if mt[lo] != raw_lo:
+                        continue
+                    _twist_range(mt, lo + 1, hi + 1)
+                    if mt[hi] == raw_hi:
+                        best = min(best, seed)
+                        break
+        return best if best < limit else -1
+
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def fill_words(base, idx, out):
+        """out[k] = twisted word idx (< N) of seed base + k, i.e. untempered output idx"""
+        nshards = 64
+        n = len(out)
+        span = (n + nshards - 1) // nshards
+        for t in prange(nshards):
+            mt = np.empty(N, dtype=np.uint32)
+            for k in range(t * span, min((t + 1) * span, n)):
+                _seed_state(mt, base + k)
+                _twist_range(mt, 0, idx + 1)
+                out[k] = mt[idx]
+
+# Seeds per GPU launch; the host checks for a hit between launches
+CUDA_BATCH = 1 << 22
+CUDA_THREADS = 256
+
+if HAS_CUDA:
+    @cuda.jit(device=True)
+    def _cuda_seed_state(mt, init, seed):
+        """Device twin of _seed_state (init = _INIT_19650218 on the device)"""
+        for w in range(N):
+            mt[w] = init[w]
+        i = 1
+        for _ in range(N):
+            p = np.int64(mt[i-1])
+            mt[i] = ((np.int64(mt[i]) ^ ((p ^ (p >> 30)) * 1664525)) + seed) & 0xffffffff
+            i += 1
+            if i >= N:
+                mt[0] = mt[N-1]
+                i = 1
+        for _ in range(N - 1):
+            p = np.int64(mt[i-1])
+            mt[i] = ((np.int64(mt[i]) ^ ((p ^ (p >> 30)) * 1566083941)) - i) & 0xffffffff
+            i += 1
+            if i >= N:
+                mt[0] = mt[N-1]
+                i = 1
+        mt[0] = UPPER_MASK
+
+    @cuda.jit(device=True)
+    def _cuda_twist_range(mt, start, stop):
+        for kk in range(start, stop):
+            y = (np.int64(mt[kk]) & UPPER_MASK) | (np.int64(mt[(kk+1) % N]) & LOWER_MASK)
+            mt[kk] = np.int64(mt[(kk+M) % N]) ^ (y >> 1) ^ (-(y & 1) & MATRIX_A)
+
+    @cuda.jit(cache=True)
+    def _cuda_scan(base, count, lo, raw_lo, hi, raw_hi, init, out):
+        """One thread per seed base + k; the smallest match is left in out[0]
+
+        The 624-word state lives in thread-local memory. Stage 2 only runs on
+        threads whose word lo matched, so divergence is limited to the rare
+        survivors.
+        """
+        k = cuda.grid(1)
+        if k >= count:
+            return
+        seed = base + k
+        mt = cuda.local.array(N, np.uint32)
+        _cuda_seed_state(mt, init, seed)
+        _cuda_twist_range(mt, 0, lo + 1)
+        if mt[lo] != raw_lo:
+            return
+        _cuda_twist_range(mt, lo + 1, hi + 1)
+        if mt[hi] == raw_hi:
+            cuda.atomic.min(out, 0, seed)
+
+def cuda_scan(base, limit, lo, raw_lo, hi, raw_hi):
+    """GPU version of brute_chunk: smallest seed in [base, limit) or -1"""
+    init = cuda.to_device(_INIT_19650218)
+    for start in range(base, limit, CUDA_BATCH):
+        count = min(CUDA_BATCH, limit - start)
+        out = cuda.to_device(np.array([limit], dtype=np.int64))
+        blocks = (count + CUDA_THREADS - 1) // CUDA_THREADS
+        _cuda_scan[blocks, CUDA_THREADS](start, count, lo, raw_lo, hi, raw_hi, init, out)
+        seed = int(out.copy_to_host()[0])
+        if seed < limit:
+            return seed
+    return -1
+
+# C kernel (mt_scan.c next to this file): same scan as brute_chunk, 8 seeds per
+# AVX2 vector and blocks spread over OpenMP threads, built with cffi
+C_KERNEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mt_scan.c")
+C_KERNEL_CDEF = "int64_t mt_scan(uint64_t base, uint64_t limit, int lo, uint32_t raw_lo, int hi, uint32_t raw_hi);"
+
+def load_c_kernel(openmp=True):
+    """Compile (once, cached in __pycache__ by source hash) and return the C mt_scan"""
+    from cffi import FFI
+
+    with open(C_KERNEL_PATH) as f:
+        source = f.read()
+    omp_flags = ["-fopenmp"] if openmp else []
+    quiet = [] if openmp else ["-Wno-unknown-pragmas"]
+    tag = hashlib.sha1((source + C_KERNEL_CDEF + str(openmp)).encode()).hexdigest()[:12]
+    name = f"_fast_solve_mt_{tag}"
+    build_dir = os.path.join(os.path.dirname(C_KERNEL_PATH), "__pycache__")
+    ffi = FFI()
+    ffi.cdef(C_KERNEL_CDEF)
+    ffi.set_source(name, source,
+                   extra_compile_args=["-O3", "-march=native"] + omp_flags + quiet,
+                   extra_link_args=omp_flags)
+
+    built = [os.path.join(build_dir, name + suffix) for suffix in importlib.machinery.EXTENSION_SUFFIXES]
+    built = [p for p in built if os.path.exists(p)]
+    path = built[0] if built else ffi.compile(tmpdir=build_dir)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.lib.mt_scan
+
+# c_kernel()'s result, built on first use rather than on import
+_c_mt_scan = None
+_c_kernel_tried = False
+
+def c_kernel():
+    """The C mt_scan (OpenMP build, else serial), or None if it cannot be built
+
+    Built on the first call only; importers that never scan (test_local.py)
+    do not run the compiler.
+    """
+    global _c_mt_scan, _c_kernel_tried
+    if not _c_kernel_tried:
+        _c_kernel_tried = True
+        for openmp in (True, False):
+            try:
+                _c_mt_scan = load_c_kernel(openmp)
+                break
+            except Exception as e:
+                print(f"[!] C kernel build failed ({'OpenMP' if openmp else 'serial'}): {e}")
+    return _c_mt_scan
+
+def init_by_seed_batch(seeds):
+    """Vectorized random.seed(): column b of the (N, B) result is the state for seeds[b] (< 2**32)
+
+    State-major (SoA) layout: each recurrence step reads and writes whole
+    contiguous rows of B lanes, and the scratch row is reused, so a step's
+    working set is three B-word rows instead of a strided column of a
+    B x 624 matrix plus fresh temporaries.
+    """
+    mt = np.empty((N, len(seeds)), dtype=np.uint32)
+    mt[:] = _INIT_19650218[:, None]
+    tmp = np.empty(len(seeds), dtype=np.uint32)
+    i = 1
+    for _ in range(N):
+        prev, cur = mt[i-1], mt[i]
+        np.right_shift(prev, 30, out=tmp)
+        tmp ^= prev
+        tmp *= _U32(1664525)
+        cur ^= tmp
+        cur += seeds
+        i += 1
+        if i >= N:
+            mt[0] = mt[N-1]
+            i = 1
+    for _ in range(N - 1):
+        prev, cur = mt[i-1], mt[i]
+        np.right_shift(prev, 30, out=tmp)
+        tmp ^= prev
+        tmp *= _U32(1566083941)
+        cur ^= tmp
+        cur -= _U32(i)
+        i += 1
+        if i >= N:
+            mt[0] = mt[N-1]
+            i = 1
+    mt[0] = UPPER_MASK
+    return mt
+
+def twist_batch(mt, start=0, stop=N):
+    """Vectorized MT19937 twist of words [start, stop) over all lanes of an (N, B) state
+
+    Twisting a prefix in place gives the same words as a full twist, so
+    callers only pay for the outputs they read.
+    """
+    y = np.empty(mt.shape[1], dtype=np.uint32)
+    mag = np.empty_like(y)
+    for kk in range(start, stop):
+        np.bitwise_and(mt[kk], _U32(UPPER_MASK), out=y)
+        np.bitwise_and(mt[(kk+1) % N], _U32(LOWER_MASK), out=mag)
+        y |= mag
+        np.bitwise_and(y, _U32(1), out=mag)
+        mag *= _U32(MATRIX_A)
+        y >>= 1
+        y ^= mag
+        np.bitwise_xor(mt[(kk+M) % N], y, out=mt[kk])
+
+def check_seeds_batch(seeds, lo, raw_lo, hi, raw_hi):
+    """Return the seeds (uint32 array) whose twisted words lo <= hi < N equal raw_lo, raw_hi
+
+    Stage 1 twists only up to the earlier index for the whole batch; stage 2
+    finishes the later index for the survivors only. Targets are untempered
+    outputs, so no lane is tempered.
+    """
+    mt = init_by_seed_batch(seeds)
+    twist_batch(mt, 0, lo + 1)
+    cand = np.nonzero(mt[lo] == raw_lo)[0]
+    if len(cand) == 0:
+        return seeds[cand]
+
+    mt = mt[:, cand]
+    twist_batch(mt, lo + 1, hi + 1)
+    return seeds[cand[mt[hi] == raw_hi]]
+
+def seed_words(idx, start, end):
+    """uint32 array of twisted word idx (< N) for every seed in [start, end), indexed by seed - start"""
+    words = np.empty(end - start, dtype=np.uint32)
+    if HAS_NUMBA:
+        fill_words(start, idx, words)
+        return words
+    for base in range(start, end, BATCH):
+        seeds = np.arange(base, min(base + BATCH, end), dtype=np.uint64).astype(np.uint32)
+        mt = init_by_seed_batch(seeds)
+        twist_batch(mt, 0, idx + 1)
+        words[base - start:base - start + len(seeds)] = mt[idx]
+    return words
+
+# Prebuilt word -> seed table (python fast_solve.py --build-table START END)
+LOOKUP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lookuptable.npz")
+
+# Suggested upper bound on a table's range: 2 GB kept, ~7.5 GB while building
+LOOKUP_TABLE_SUGGESTED_SEEDS = 1 << 28
+
+def build_lookup_table(idx, start, end):
+    """Table of twisted word idx (< N) for every seed in [start, end), sorted for lookup_seed
+
+    Returns (idx, start, end, words, seeds) with words ascending and
+    seeds[i] the seed producing words[i] (ascending among equal words).
+    Building costs one scan of the range; afterwards each query on the
+    same range is a binary search. The table keeps 8 bytes per seed (~32 GB
+    for all 2**32 seeds) and building peaks at ~28 bytes per seed while
+    sorting, so keep ranges to LOOKUP_TABLE_SUGGESTED_SEEDS or so.
+    """
+    words = seed_words(idx, start, end)
+    order = np.argsort(words, kind='stable')
+    seeds = (order.astype(np.uint64) + start).astype(np.uint32)
+    return idx, start, end, words[order], seeds
+
+def save_lookup_table(table, path=LOOKUP_TABLE_PATH):
+    """Save a build_lookup_table result to path as an npz
+
+    Arrays: idx, start, end (0-d ints), words (uint32, ascending) and
+    seeds (uint32, seeds[i] produces words[i]); load_lookup_table reads it back.
+    """
+    idx, start, end, words, seeds = table
+    np.savez(path, idx=idx, start=start, end=end, words=words, seeds=seeds)
+
+def load_lookup_table(path=LOOKUP_TABLE_PATH):
+    """The table saved in path, or None if there is none (or numpy is missing)"""
+    if not HAS_NUMPY or not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return (int(data['idx']), int(data['start']), int(data['end']),
+                data['words'], data['seeds'])
+
+def lookup_seed(table, idx1, idx2, val1, val2, start=0, end=2**32):
+    """Smallest seed in [start, end) for outputs idx1/idx2 from a build_lookup_table table, or None
+
+    The table must have been built for idx1 or idx2. Every seed whose word
+    matches is confirmed on the other output, which also rules out the
+    birthday collisions of a large range.
+    """
+    idx, _, _, words, seeds = table
+    if idx not in (idx1, idx2):
+        raise ValueError(f"table is keyed on output {idx}, not {idx1} or {idx2}")
+    raw = untemper(val1 if idx == idx1 else val2)
+    a = np.searchsorted(words, raw, side='left')
+    b = np.searchsorted(words, raw, side='right')
+    for seed in seeds[a:b]:
+        seed = int(seed)
+        if start <= seed < end and matches_two_stage(seed, idx1, idx2, val1, val2):
+            return seed
+    return None
+
+def table_covers(table, idx1, idx2, start, end):
+    """True if table answers queries on outputs idx1/idx2 over [start, end)"""
+    return (table is not None and table[0] in (idx1, idx2)
+            and table[1] <= start and end <= table[2])
+
+def scan_range(idx1, idx2, val1, val2, base, limit):
+    """Return the first seed in [base, limit) matching both outputs, or None"""
+    (lo, vlo), (hi, vhi) = sorted([(idx1, val1), (idx2, val2)])
+    if hi < N:
+        # Kernels compare raw state words against the untempered targets
+        rlo, rhi = untemper(vlo), untemper(vhi)
+        if HAS_CUDA and HAS_NUMPY:
+            seed = cuda_scan(base, limit, lo, rlo, hi, rhi)
+            return seed if seed >= 0 else None
+
+        c_mt_scan = c_kernel()
+        if c_mt_scan is not None:
+            seed = c_mt_scan(base, limit, lo, rlo, hi, rhi)
+            return seed if seed >= 0 else None
+
+        if HAS_NUMBA:
+            seed = brute_chunk(base, limit, lo, rlo, hi, rhi)
+            return seed if seed >= 0 else None
+
+        if HAS_NUMPY:
+            for start in range(base, limit, BATCH):
+                seeds = np.arange(start, min(start + BATCH, limit), dtype=np.uint64).astype(np.uint32)
+                hits = check_seeds_batch(seeds, lo, rlo, hi, rhi)
+                if len(hits):
+                    return int(hits[0])
+            return None
+
+    for seed in range(base, limit):
+        if matches_two_stage(seed, idx1, idx2, val1, val2):
+            return seed
+    return None
+
+def brute_force_optimized(idx1, idx2, val1, val2, start=0, end=2**32, table=None):
+    """Optimized brute force; a lookup table covering the query replaces the scan"""
+    if table_covers(table, idx1, idx2, start, end):
+        print(f"[*] Looking up range [{start:,}, {end:,}) in the table for output {table[0]}")
+        return lookup_seed(table, idx1, idx2, val1, val2, start, end)
+
     print(f"[*] Brute forcing range [{start:,}, {end:,})")
-    print(f"[*] Using Numba JIT: {HAS_NUMBA}")
+    # The C kernel is only built when CUDA does not take precedence
+    use_c = not (HAS_CUDA and HAS_NUMPY) and c_kernel() is not None
+    print(f"[*] Using CUDA: {HAS_CUDA}, C kernel: {use_c}, Numba JIT: {HAS_NUMBA}, NumPy batches: {HAS_NUMPY}")
 
-    chunk = 1000000
+    chunk = 1 << 24
     for base in range(start, end, chunk):
-        if base % 10000000 == 0 and base > start:
+        if base > start:
             print(f"    Progress: {base:,}/{end:,}")
 
         limit = min(base + chunk, end)
-        for seed in range(base, limit):
-            if check_seed_fast(seed, idx1, idx2, val1, val2):
-                return seed
+        seed = scan_range(idx1, idx2, val1, val2, base, limit)
+        if seed is not None:
+            return seed
 
     return None
 
@@ -98,23 +528,20 @@ def solve_remote(host, port):
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.connect((host, port))
 
-    data = s.recv(1024).decode()
+    sock_file = s.makefile('rb', buffering=65536)
+    data = sock_file.readline().decode()
     print(f"\n{data.strip()}\n")
 
     idx1, idx2 = 0, 1
     print(f"[+] Sending indices: {idx1}, {idx2}")
     s.sendall(f"{idx1}\n{idx2}\n".encode())
 
-    # Receive all data
-    all_data = b""
-    while all_data.count(b'\n') < 2019:
-        all_data += s.recv(8192)
-
-    lines = all_data.decode().strip().split('\n')
+    # Receive all 2019 lines through the buffered reader
+    lines = [sock_file.readline().rstrip(b'\r\n') for _ in range(2019)]
     revealed = []
-    for i, line in enumerate(lines[:2019]):
-        if line.strip() != 'Nope!':
-            val = int(line.strip())
+    for i, line in enumerate(lines):
+        if line != b'Nope!':
+            val = int(line)
             revealed.append(val)
             print(f"[*] Output[{i}] = {val}")
 
@@ -127,27 +554,28 @@ def solve_remote(host, port):
 
     # Range 1: 0-50M (most likely)
     print("[*] Range 1: 0-50,000,000")
-    seed = brute_force_optimized(idx1, idx2, val1, val2, 0, 50000000)
+    table = load_lookup_table()
+    seed = brute_force_optimized(idx1, idx2, val1, val2, 0, 50000000, table)
 
     if seed is None:
         # Range 2: 10M-2^31
         print("\n[*] Range 2: 50M-2^31")
-        seed = brute_force_optimized(idx1, idx2, val1, val2, 50000000, 2**31)
+        seed = brute_force_optimized(idx1, idx2, val1, val2, 50000000, 2**31, table)
 
     if seed is not None:
         print(f"\n{'='*70}")
         print(f"[+] FOUND SEED: {seed}")
         print(f"{'='*70}\n")
 
-        # Predict 2020th
-        random.seed(seed)
-        for _ in range(2020):
-            prediction = random.getrandbits(32)
+        # Predict 2020th: skip outputs 0..2018 in one getrandbits call
+        rng = random.Random(seed)
+        rng.getrandbits(32 * 2019)
+        prediction = rng.getrandbits(32)
 
         print(f"[+] Sending prediction: {prediction}")
         s.sendall(f"{prediction}\n".encode())
 
-        response = s.recv(4096).decode()
+        response = sock_file.read1(4096).decode()
         print(f"\n{'='*70}")
         print("RESPONSE:")
         print(f"{'='*70}")
@@ -155,7 +583,67 @@ def solve_remote(host, port):
     else:
         print("\n[-] Could not find seed!")
 
+    sock_file.close()
     s.close()
 
+def build_kernels():
+    """Compile ahead of time what scan_range and seed_words will use on this machine
+
+    Only the backend scan_range dispatches to is prepared (the C kernel is
+    cached in __pycache__, keyed by the hash of mt_scan.c); Numba's
+    fill_words is compiled too since seed_words uses it whatever the scan
+    backend. Numba kernels land in its on-disk cache.
+    """
+    if HAS_CUDA and HAS_NUMPY:
+        cuda_scan(0, 1, 0, 0, 1, 0)
+        backend = "CUDA kernel compiled"
+    elif c_kernel() is not None:
+        backend = "C kernel built"
+    elif HAS_NUMBA:
+        brute_chunk(0, LANES, 0, 0, 1, 0)
+        backend = "Numba brute_chunk compiled"
+    elif HAS_NUMPY:
+        backend = "NumPy batches (nothing to compile)"
+    else:
+        backend = "random module (nothing to compile)"
+    print(f"[*] Scan backend: {backend}")
+
+    if HAS_NUMBA:
+        fill_words(0, 0, np.empty(1, dtype=np.uint32))
+        print("[*] Numba fill_words compiled for seed tables")
+
+def check_lookup_table(samples=8):
+    """Self-check: lookup_seed must agree with scan_range, hits and misses"""
+    start, end = 10000, 40000
+    table = build_lookup_table(0, start, end)
+    for seed in random.sample(range(start - 100, end + 100), samples):
+        rng = random.Random(seed)
+        outputs = [rng.getrandbits(32) for _ in range(6)]
+        for idx1, idx2 in ((0, 1), (5, 0)):
+            for val2 in (outputs[idx2], outputs[idx2] ^ 1):
+                got = lookup_seed(table, idx1, idx2, outputs[idx1], val2, start, end)
+                want = scan_range(idx1, idx2, outputs[idx1], val2, start, end)
+                assert got == want, (seed, idx1, idx2, got, want)
+    print("[+] lookup table agrees with scan_range")
+
 if __name__ == '__main__':
-    solve_remote('archive.cryptohack.org', 63222)
+    if '--build' in sys.argv[1:]:
+        build_kernels()
+    elif '--build-table' in sys.argv[1:]:
+        # python fast_solve.py --build-table START END: output-0 table for solve_remote
+        # (8 bytes per seed; keep END - START around 2**28 or below)
+        pos = sys.argv.index('--build-table')
+        if len(sys.argv) < pos + 3:
+            print("usage: fast_solve.py --build-table START END "
+                  f"(END - START <= {LOOKUP_TABLE_SUGGESTED_SEEDS:,} suggested: 8 bytes per seed, ~28 while building)")
+            sys.exit(1)
+        start, end = int(sys.argv[pos + 1]), int(sys.argv[pos + 2])
+        if end - start > LOOKUP_TABLE_SUGGESTED_SEEDS:
+            print(f"[!] {end - start:,} seeds: ~{(end - start) * 28 / 2**30:.1f} GB while building, "
+                  f"{(end - start) * 8 / 2**30:.1f} GB saved")
+        save_lookup_table(build_lookup_table(0, start, end))
+        print(f"[+] Saved table for seeds [{start:,}, {end:,}) to {LOOKUP_TABLE_PATH}")
+    elif '--check-table' in sys.argv[1:]:
+        check_lookup_table()
+    else:
+        solve_remote('archive.cryptohack.org', 63222)
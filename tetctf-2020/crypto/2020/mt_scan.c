@@ -0,0 +1,195 @@
+/*
+ * MT19937 seed scan for fast_solve.py, built through cffi.
+ *
+ * mt_scan(base, limit, lo, raw_lo, hi, raw_hi) returns the smallest seed in
+ * [base, limit) for which CPython's random.seed(seed) yields untempered
+ * outputs raw_lo at index lo and raw_hi at index hi (lo <= hi < 624), or -1.
+ * Seeds are scanned in blocks of BLOCK; with OpenMP the blocks are spread
+ * over threads, each with its state on its own stack.
+ */
+#include <stdint.h>
+#include <string.h>
+
+#define N 624
+#define M 397
+
+static uint32_t base_state[N];
+static int base_ready = 0;
+
+static void init_base(void)
+{
+    base_state[0] = 19650218u;
+    for (int i = 1; i < N; i++)
+        base_state[i] = 1812433253u * (base_state[i-1] ^ (base_state[i-1] >> 30)) + i;
+    base_ready = 1;
+}
+
+/* CPython random.seed(seed) for seed < 2**32: init_by_array with key [seed] */
+static void seed_state(uint32_t *mt, uint32_t seed)
+{
+    int i = 1;
+    memcpy(mt, base_state, sizeof(base_state));
+    for (int k = N; k; k--) {
+        mt[i] = (mt[i] ^ ((mt[i-1] ^ (mt[i-1] >> 30)) * 1664525u)) + seed;
+        if (++i >= N) { mt[0] = mt[N-1]; i = 1; }
+    }
+    for (int k = N - 1; k; k--) {
+        mt[i] = (mt[i] ^ ((mt[i-1] ^ (mt[i-1] >> 30)) * 1566083941u)) - (uint32_t)i;
+        if (++i >= N) { mt[0] = mt[N-1]; i = 1; }
+    }
+    mt[0] = 0x80000000u;
+}
+
+static void twist_range(uint32_t *mt, int start, int stop)
+{
+    for (int kk = start; kk < stop; kk++) {
+        uint32_t y = (mt[kk] & 0x80000000u) | (mt[(kk+1) % N] & 0x7fffffffu);
+        mt[kk] = mt[(kk+M) % N] ^ (y >> 1) ^ (-(y & 1u) & 0x9908b0dfu);
+    }
+}
+
+static int check_seed(uint32_t seed, int lo, uint32_t raw_lo, int hi, uint32_t raw_hi)
+{
+    uint32_t mt[N];
+
+    seed_state(mt, seed);
+    twist_range(mt, 0, lo + 1);
+    if (mt[lo] != raw_lo)
+        return 0;
+    twist_range(mt, lo + 1, hi + 1);
+    return mt[hi] == raw_hi;
+}
+
+/* Seeds per scheduling unit: GROUPS vectors of 8 lanes on the AVX2 path */
+#define BLOCK 64
+
+static int64_t scan_block_scalar(uint64_t base, uint64_t count, int lo, uint32_t raw_lo, int hi, uint32_t raw_hi)
+{
+    for (uint64_t s = base; s < base + count; s++)
+        if (check_seed((uint32_t)s, lo, raw_lo, hi, raw_hi))
+            return (int64_t)s;
+    return -1;
+}
+
+#ifdef __AVX2__
+#include <immintrin.h>
+
+/* 8 seeds per __m256i; GROUPS independent vectors are stepped together so
+   the vpmulld latency of one seeding chain overlaps the others */
+#define GROUPS 8
+
+/* Scan [base, base + BLOCK) and return the matching seed or -1. The state is
+   word-major (SoA): S[w][g] holds word w of 8 lanes. Only stage 1 (twisted
+   word lo, lo < N - M so it reads untwisted words) is vectorized; lanes that
+   pass are rechecked with the scalar path. */
+static int64_t scan_block_avx2(uint64_t base, int lo, uint32_t raw_lo, int hi, uint32_t raw_hi)
+{
+    __m256i S[N][GROUPS];
+    __m256i seeds[GROUPS];
+    const __m256i mul1 = _mm256_set1_epi32(1664525);
+    const __m256i mul2 = _mm256_set1_epi32(1566083941);
+    const __m256i upper = _mm256_set1_epi32((int)0x80000000u);
+    const __m256i lower = _mm256_set1_epi32(0x7fffffff);
+    const __m256i one = _mm256_set1_epi32(1);
+    const __m256i matrix_a = _mm256_set1_epi32((int)0x9908b0dfu);
+    const __m256i target = _mm256_set1_epi32((int)raw_lo);
+    int i = 1;
+
+    for (int g = 0; g < GROUPS; g++)
+        seeds[g] = _mm256_add_epi32(_mm256_set1_epi32((int)(uint32_t)(base + 8 * g)),
+                                    _mm256_setr_epi32(0, 1, 2, 3, 4, 5, 6, 7));
+    for (int w = 0; w < N; w++)
+        for (int g = 0; g < GROUPS; g++)
+            S[w][g] = _mm256_set1_epi32((int)base_state[w]);
+
+    for (int k = N; k; k--) {
+        for (int g = 0; g < GROUPS; g++) {
+            __m256i p = S[i-1][g];
+            __m256i x = _mm256_mullo_epi32(_mm256_xor_si256(p, _mm256_srli_epi32(p, 30)), mul1);
+            S[i][g] = _mm256_add_epi32(_mm256_xor_si256(S[i][g], x), seeds[g]);
+        }
+        if (++i >= N) {
+            for (int g = 0; g < GROUPS; g++)
+                S[0][g] = S[N-1][g];
+            i = 1;
+        }
+    }
+    for (int k = N - 1; k; k--) {
+        __m256i iv = _mm256_set1_epi32(i);
+        for (int g = 0; g < GROUPS; g++) {
+            __m256i p = S[i-1][g];
+            __m256i x = _mm256_mullo_epi32(_mm256_xor_si256(p, _mm256_srli_epi32(p, 30)), mul2);
+            S[i][g] = _mm256_sub_epi32(_mm256_xor_si256(S[i][g], x), iv);
+        }
+        if (++i >= N) {
+            for (int g = 0; g < GROUPS; g++)
+                S[0][g] = S[N-1][g];
+            i = 1;
+        }
+    }
+    for (int g = 0; g < GROUPS; g++)
+        S[0][g] = upper;
+
+    for (int g = 0; g < GROUPS; g++) {
+        /* branchless twist: mag = -(y & 1) & MATRIX_A */
+        __m256i y = _mm256_or_si256(_mm256_and_si256(S[lo][g], upper),
+                                    _mm256_and_si256(S[lo+1][g], lower));
+        __m256i mag = _mm256_and_si256(_mm256_sub_epi32(_mm256_setzero_si256(),
+                                                        _mm256_and_si256(y, one)), matrix_a);
+        __m256i t = _mm256_xor_si256(_mm256_xor_si256(S[lo+M][g], _mm256_srli_epi32(y, 1)), mag);
+        int mask = _mm256_movemask_ps(_mm256_castsi256_ps(_mm256_cmpeq_epi32(t, target)));
+        while (mask) {
+            uint32_t seed = (uint32_t)(base + 8 * g + __builtin_ctz(mask));
+            mask &= mask - 1;
+            if (check_seed(seed, lo, raw_lo, hi, raw_hi))
+                return seed;
+        }
+    }
+    return -1;
+}
+#endif
+
+/* raw_lo / raw_hi are untempered outputs, compared directly to the state */
+int64_t mt_scan(uint64_t base, uint64_t limit, int lo, uint32_t raw_lo, int hi, uint32_t raw_hi)
+{
+    int64_t nblocks = (int64_t)((limit - base) / BLOCK);
+    uint64_t tail = base + (uint64_t)nblocks * BLOCK;
+    uint64_t best = limit;
+    int vec = 0;
+
+    if (!base_ready)
+        init_base();
+#ifdef __AVX2__
+    vec = lo < N - M;
+#endif
+
+    #pragma omp parallel for schedule(dynamic, 16)
+    for (int64_t b = 0; b < nblocks; b++) {
+        uint64_t s = base + (uint64_t)b * BLOCK;
+        uint64_t cur;
+        int64_t hit;
+
+        /* blocks past a hit already found cannot hold the smallest seed */
+        #pragma omp atomic read
+        cur = best;
+        if (s >= cur)
+            continue;
+#ifdef __AVX2__
+        hit = vec ? scan_block_avx2(s, lo, raw_lo, hi, raw_hi)
+                  : scan_block_scalar(s, BLOCK, lo, raw_lo, hi, raw_hi);
+#else
+        (void)vec;
+        hit = scan_block_scalar(s, BLOCK, lo, raw_lo, hi, raw_hi);
+#endif
+        if (hit >= 0) {
+            #pragma omp critical
+            if ((uint64_t)hit < best) {
+                #pragma omp atomic write
+                best = (uint64_t)hit;
+            }
+        }
+    }
+    if (best < limit)
+        return (int64_t)best;
+    return scan_block_scalar(tail, limit - tail, lo, raw_lo, hi, raw_hi);
+}
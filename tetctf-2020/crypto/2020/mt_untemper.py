@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+MT19937 tempering and its inverse
+
+Python's random.getrandbits(32) returns temper(word) for the next word of
+the twisted MT state, so untemper() turns a revealed output back into that
+state word. Note this is *not* the seed: random.seed(n) goes through
+init_by_array(), which sets state[0] = 0x80000000 and mixes the seed into
+every word before the first twist.
+
+matches_two_stage() is the scalar seed check the solvers share.
+"""
+
+import random
+import _random
+
+def temper(y):
+    """MT19937 tempering of one 32-bit state word"""
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9D2C5680
+    y ^= (y << 15) & 0xEFC60000
+    y ^= y >> 18
+    return y & 0xFFFFFFFF
+
+def untemper(y):
+    """Invert MT19937 tempering: the raw state word behind a 32-bit output"""
+    y ^= y >> 18
+    y ^= (y << 15) & 0xEFC60000
+    y ^= ((y << 7) & 0x9D2C5680) ^ ((y << 14) & 0x94284000) ^ ((y << 21) & 0x14200000) ^ ((y << 28) & 0x10000000)
+    y ^= (y >> 11) ^ (y >> 22)
+    return y & 0xFFFFFFFF
+
+# Private generator for matches_two_stage, seeded through the C method
+# _random.Random.seed directly (skips random.py's Python-level seed() wrapper)
+_scan_rng = random.Random()
+_c_seed = _random.Random.seed
+_getrandbits = _scan_rng.getrandbits
+
+def matches_two_stage(seed, idx1, idx2, val1, val2):
+    """Check if random.seed(seed) produces val1 at output idx1 and val2 at idx2
+
+    Only the earlier output is drawn and compared first; the later one is
+    drawn only for the rare seeds that pass. Skipped outputs are consumed by
+    one getrandbits(32*k) call, which draws exactly k 32-bit words.
+    """
+    if idx1 > idx2:
+        idx1, idx2, val1, val2 = idx2, idx1, val2, val1
+    _c_seed(_scan_rng, seed)
+    _getrandbits(32 * idx1)
+    if _getrandbits(32) != val1:
+        return False
+    if idx2 == idx1:
+        return val2 == val1
+    _getrandbits(32 * (idx2 - idx1 - 1))
+    return _getrandbits(32) == val2
+
+if __name__ == '__main__':
+
+    for _ in range(100000):
+        x = random.getrandbits(32)
+        assert untemper(temper(x)) == x
+    print("[+] untemper(temper(x)) == x for 100000 random words")
@@ -7,16 +7,7 @@ No external dependencies needed
 import random
 import time
 
-def check_seed(seed, idx1, idx2, val1, val2):
-    """Check if a seed produces the expected values at given indices"""
-    random.seed(seed)
-    for i in range(max(idx1, idx2) + 1):
-        r = random.getrandbits(32)
-        if i == idx1 and r != val1:
-            return False
-        if i == idx2 and r != val2:
-            return False
-    return True
+from mt_untemper import matches_two_stage
 
 def brute_force_seed(idx1, idx2, val1, val2, max_seed=2**32):
     """Brute force the seed - optimized for time-based seeds"""
@@ -25,40 +16,42 @@ def brute_force_seed(idx1, idx2, val1, val2, max_seed=2**32):
 
     # Strategy 1: Try small seeds first (often used in CTFs)
     print("[*] Trying small seeds (0-1000000)...")
-    for seed in range(1000000):
-        if seed % 100000 == 0:
-            print(f"    Progress: {seed}")
-        if check_seed(seed, idx1, idx2, val1, val2):
-            print(f"[+] Found seed: {seed}")
-            return seed
+    for base in range(0, 1000000, 100000):
+        print(f"    Progress: {base}")
+        for seed in range(base, base + 100000):
+            if matches_two_stage(seed, idx1, idx2, val1, val2):
+                print(f"[+] Found seed: {seed}")
+                return seed
 
     # Strategy 2: Try time-based seeds (last hour to next hour)
     print("[*] Trying time-based seeds...")
     current_time = int(time.time())
     for offset in range(-3600, 3600):
         seed = current_time + offset
-        if check_seed(seed, idx1, idx2, val1, val2):
+        if matches_two_stage(seed, idx1, idx2, val1, val2):
             print(f"[+] Found seed: {seed}")
             return seed
 
     # Strategy 3: Full range if needed (very slow)
     print(f"[*] Full range search up to {max_seed} (this will take a while)...")
-    for seed in range(max_seed):
-        if seed % 10000000 == 0:
-            print(f"    Progress: {seed}/{max_seed}")
-        if check_seed(seed, idx1, idx2, val1, val2):
-            print(f"[+] Found seed: {seed}")
-            return seed
+    for base in range(0, max_seed, 10000000):
+        print(f"    Progress: {base}/{max_seed}")
+        for seed in range(base, min(base + 10000000, max_seed)):
+            if matches_two_stage(seed, idx1, idx2, val1, val2):
+                print(f"[+] Found seed: {seed}")
+                return seed
 
     return None
 
 def predict_2020th(seed):
-    """Generate the 2020th number from the seed"""
-    random.seed(seed)
-    result = None
-    for i in range(2020):
-        result = random.getrandbits(32)
-    return result
+    """Generate the 2020th number from the seed
+
+    getrandbits(32 * 2019) draws outputs 0..2018 (one MT word per 32 bits)
+    in a single C call, so only the 2020th output comes back to Python.
+    """
+    rng = random.Random(seed)
+    rng.getrandbits(32 * 2019)
+    return rng.getrandbits(32)
 
 def interactive_solve():
     """Interactive solver for connecting to the challenge"""
@@ -15,30 +15,60 @@ from z3 import *
 import random
 import time
 
-def symbolic_mt19937_step(state, index):
-    """Symbolically compute one MT19937 output"""
-    # MT19937 parameters
-    w, n, m, r = 32, 624, 397, 31
-    a = 0x9908B0DF
-    u, d = 11, 0xFFFFFFFF
-    s, b = 7, 0x9D2C5680
-    t, c = 15, 0xEFC60000
-    l = 18
-    f = 1812433253
-
-    # Temper the output
-    y = state[index]
-    y = y ^ LShR(y, u)
-    y = y ^ ((y << s) & b)
-    y = y ^ ((y << t) & c)
-    y = y ^ LShR(y, l)
-    return y & 0xFFFFFFFF
-
-def solve_with_z3(idx1, idx2, val1, val2, seed_min=0, seed_max=2**32):
-    """Use Z3 to solve for the seed"""
+from mt_untemper import untemper
+
+def symbolic_seed_state(seed):
+    """Symbolic state right after random.seed(seed), as expressions of the single BitVec `seed`
+
+    CPython seeds through init_by_array([seed]) (for seed < 2**32), not
+    init_genrand(seed). The recurrence is substituted inline, so the words
+    are shared expression nodes rather than 624 extra variables plus
+    equality constraints. The seed-independent init_genrand(19650218) prefix
+    is computed with Python ints.
+    """
+    base = [19650218]
+    for i in range(1, 624):
+        base.append((1812433253 * (base[i-1] ^ (base[i-1] >> 30)) + i) & 0xFFFFFFFF)
+    mt = [BitVecVal(x, 32) for x in base]
+
+    i = 1
+    for _ in range(624):
+        mt[i] = (mt[i] ^ ((mt[i-1] ^ LShR(mt[i-1], 30)) * 1664525)) + seed
+        i += 1
+        if i >= 624:
+            mt[0] = mt[623]
+            i = 1
+    for _ in range(623):
+        mt[i] = (mt[i] ^ ((mt[i-1] ^ LShR(mt[i-1], 30)) * 1566083941)) - i
+        i += 1
+        if i >= 624:
+            mt[0] = mt[623]
+            i = 1
+    mt[0] = BitVecVal(0x80000000, 32)
+    return mt
+
+def symbolic_twist_prefix(mt, stop):
+    """Twist words [0, stop) in place; outputs 0..623 are the tempered twisted words"""
+    for kk in range(stop):
+        y = (mt[kk] & 0x80000000) | (mt[(kk + 1) % 624] & 0x7FFFFFFF)
+        mag = If(y & 1 == 1, BitVecVal(0x9908B0DF, 32), BitVecVal(0, 32))
+        mt[kk] = mt[(kk + 397) % 624] ^ LShR(y, 1) ^ mag
+
+# Widest seed range solve_with_z3 is asked to cover. With the full
+# init_by_array model a 4-seed range takes ~20 s, 16 seeds ~100 s and 1000
+# seeds did not finish in 10 minutes, so Z3 only confirms a seed near a good
+# guess; scanning a real range is fast_solve.py / simple_solve.py's job.
+Z3_MAX_RANGE = 8
+
+def solve_with_z3(idx1, idx2, val1, val2, seed_min, seed_max):
+    """Use Z3 to solve for the seed in a small range [seed_min, seed_max)
+
+    The range must be a window around a seed guess (main() asks for one),
+    at most Z3_MAX_RANGE seeds wide to finish in under a minute.
+    """
     print(f"[*] Using Z3 solver for seed in range [{seed_min}, {seed_max})")
 
-    # Create Z3 variables
+    # The seed is the only variable
     seed = BitVec('seed', 32)
     solver = Solver()
 
@@ -46,22 +76,14 @@ def solve_with_z3(idx1, idx2, val1, val2, seed_min=0, seed_max=2**32):
     solver.add(UGE(seed, seed_min))
     solver.add(ULT(seed, seed_max))
 
-    # Initialize MT state symbolically
-    mt = [BitVec(f'mt_{i}', 32) for i in range(624)]
-    solver.add(mt[0] == seed)
-
-    # Generate initial state
-    for i in range(1, 624):
-        solver.add(mt[i] == (1812433253 * (mt[i-1] ^ LShR(mt[i-1], 30)) + i) & 0xFFFFFFFF)
-
-    # Add constraints for known outputs
-    # This is complex because we need to handle the twist operation
-    # For simplicity, let's assume indices are before first twist (< 624)
+    # Outputs 0..623 all come from the first twist of the seeded state
     if max(idx1, idx2) < 624:
-        out1 = symbolic_mt19937_step(mt, idx1)
-        out2 = symbolic_mt19937_step(mt, idx2)
-        solver.add(out1 == val1)
-        solver.add(out2 == val2)
+        mt = symbolic_seed_state(seed)
+        symbolic_twist_prefix(mt, max(idx1, idx2) + 1)
+        # Tempering is a bijection: untemper the observed outputs once in
+        # Python and constrain the state words, keeping it out of the formula
+        solver.add(mt[idx1] == untemper(val1))
+        solver.add(mt[idx2] == untemper(val2))
 
         print("[*] Solving constraints...")
         if solver.check() == sat:
@@ -77,11 +99,10 @@ def solve_with_z3(idx1, idx2, val1, val2, seed_min=0, seed_max=2**32):
         return None
 
 def predict_2020th(seed):
-    """Predict the 2020th number given the seed"""
-    random.seed(seed)
-    for i in range(2020):
-        result = random.getrandbits(32)
-    return result
+    """Predict the 2020th number given the seed (outputs 0..2018 skipped in one call)"""
+    rng = random.Random(seed)
+    rng.getrandbits(32 * 2019)
+    return rng.getrandbits(32)
 
 def main():
     print("=== TetCTF 2020 - 2020 Challenge Solver ===\n")
@@ -103,21 +124,22 @@ def main():
     val1 = int(input(f"Enter value at index {idx1}: "))
     val2 = int(input(f"Enter value at index {idx2}: "))
 
-    # Try to solve with Z3 (works if indices < 624)
+    # Try to solve with Z3 (works if indices < 624) around a seed guess
     if max(idx1, idx2) < 624:
-        seed = solve_with_z3(idx1, idx2, val1, val2, 0, 2**20)  # Limit range for speed
+        guess = int(input("Enter a seed guess (e.g. a timestamp): "))
+        seed_min = max(guess - Z3_MAX_RANGE // 2, 0)
+        seed_max = seed_min + Z3_MAX_RANGE
+        seed = solve_with_z3(idx1, idx2, val1, val2, seed_min, seed_max)
 
         if seed is None:
-            print("[*] Trying larger seed range...")
-            seed = solve_with_z3(idx1, idx2, val1, val2, 0, 2**32)
-
-        if seed is not None:
-            prediction = predict_2020th(seed)
-            print(f"\n[+] Prediction for 2020th number: {prediction}")
-            # io.sendline(str(prediction).encode())
-            # print(io.recvall().decode())
-        else:
-            print("[-] Could not recover seed")
+            print(f"[-] Seed not in [{seed_min}, {seed_max}); "
+                  "brute force a wider range with fast_solve.py or simple_solve.py")
+            return
+
+        prediction = predict_2020th(seed)
+        print(f"\n[+] Prediction for 2020th number: {prediction}")
+        # io.sendline(str(prediction).encode())
+        # print(io.recvall().decode())
     else:
         print("[-] Indices too large. Try indices < 624")
 
@@ -140,7 +162,7 @@ if __name__ == '__main__':
         print(f"[*] Values: {outputs[idx1]} at {idx1}, {outputs[idx2]} at {idx2}")
         print(f"[*] Target (2020th): {outputs[2019]}")
 
-        seed = solve_with_z3(idx1, idx2, outputs[idx1], outputs[idx2], 0, 1000)
+        seed = solve_with_z3(idx1, idx2, outputs[idx1], outputs[idx2], test_seed - 2, test_seed + 2)
         if seed == test_seed:
             print(f"[+] Test passed! Recovered seed: {seed}")
             prediction = predict_2020th(seed)
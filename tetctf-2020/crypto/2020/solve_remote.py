@@ -6,34 +6,66 @@ Solve the remote challenge at archive.cryptohack.org:63222
 import socket
 import random
 import time
-from multiprocessing import Pool, cpu_count
-
-def check_seed_match(args):
-    """Check if a seed matches - for multiprocessing"""
-    seed, idx1, idx2, val1, val2 = args
-    random.seed(seed)
-    for i in range(max(idx1, idx2) + 1):
-        r = random.getrandbits(32)
-        if i == idx1 and r != val1:
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Value, cpu_count
+
+from mt_untemper import matches_two_stage
+
+def _shard_bounds(start, end, shards):
+    """Yield (a, b) bounds splitting [start, end) into contiguous shards"""
+    span = end - start
+    for i in range(shards):
+        yield start + i * span // shards, start + (i + 1) * span // shards
+
+# Seeds scanned between two looks at the shared hit flag
+POLL_INTERVAL = 100000
+
+# Shared-memory hit flag (-1 = nothing found yet), bound in each worker by
+# _init_worker so it is inherited once rather than sent with every task
+_found = None
+
+def _init_worker(found):
+    global _found
+    _found = found
+
+def scan_shard(bounds, idx1, idx2, val1, val2):
+    """Scan one contiguous seed range in a worker process
+
+    Only the (a, b) bounds travel with the task; the seeds are generated
+    locally. The shared flag is checked every POLL_INTERVAL seeds, so all
+    workers stop soon after any of them finds the seed.
+    """
+    shard_start, shard_end = bounds
+    for block_start in range(shard_start, shard_end, POLL_INTERVAL):
+        if _found is not None and _found.value != -1:
             return None
-        if i == idx2 and r != val2:
-            return None
-    return seed
+        for seed in range(block_start, min(block_start + POLL_INTERVAL, shard_end)):
+            if matches_two_stage(seed, idx1, idx2, val1, val2):
+                if _found is not None:
+                    _found.value = seed
+                return seed
+    return None
 
 def brute_force_seed_parallel(idx1, idx2, val1, val2, start, end):
-    """Brute force using multiprocessing"""
+    """Brute force over contiguous range shards in a process pool"""
     print(f"[*] Parallel brute force from {start:,} to {end:,}")
 
-    chunk_size = 10000
-    with Pool(processes=cpu_count()) as pool:
-        args_list = [(seed, idx1, idx2, val1, val2) for seed in range(start, end)]
-
-        for i, result in enumerate(pool.imap_unordered(check_seed_match, args_list, chunksize=chunk_size)):
-            if i % 1000000 == 0 and i > 0:
-                print(f"    Progress: {start + i:,}/{end:,}")
+    workers = cpu_count()
+    # A few shards per worker keeps all cores busy until the end
+    shards = workers * 4
+    # 64-bit: timestamp seeds do not fit a C int
+    found = Value('q', -1)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(found,)) as pool:
+        futures = [pool.submit(scan_shard, bounds, idx1, idx2, val1, val2)
+                   for bounds in _shard_bounds(start, end, shards)]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
             if result is not None:
-                pool.terminate()
+                for pending in futures:
+                    pending.cancel()
                 return result
+            print(f"    Progress: {done}/{shards} shards done")
 
     return None
 
@@ -43,32 +75,23 @@ def brute_force_seed(idx1, idx2, val1, val2, max_seed=10000000):
     print(f"    output[{idx1}] = {val1}")
     print(f"    output[{idx2}] = {val2}")
 
-    for seed in range(max_seed):
-        if seed % 100000 == 0 and seed > 0:
-            print(f"    Progress: {seed:,}/{max_seed:,}")
-
-        random.seed(seed)
-        match = True
-        for i in range(max(idx1, idx2) + 1):
-            r = random.getrandbits(32)
-            if i == idx1 and r != val1:
-                match = False
-                break
-            if i == idx2 and r != val2:
-                match = False
-                break
-
-        if match:
-            return seed
+    for base in range(0, max_seed, POLL_INTERVAL):
+        if base > 0:
+            print(f"    Progress: {base:,}/{max_seed:,}")
+        for seed in range(base, min(base + POLL_INTERVAL, max_seed)):
+            if matches_two_stage(seed, idx1, idx2, val1, val2):
+                return seed
 
     return None
 
 def predict_2020th(seed):
-    """Predict the 2020th number"""
-    random.seed(seed)
-    for i in range(2020):
-        result = random.getrandbits(32)
-    return result
+    """Predict the 2020th number
+
+    The 2019 discarded outputs are drawn by one getrandbits(32 * 2019) call.
+    """
+    rng = random.Random(seed)
+    rng.getrandbits(32 * 2019)
+    return rng.getrandbits(32)
 
 def solve_remote(host, port):
     """Connect and solve the remote challenge"""
@@ -80,8 +103,11 @@ def solve_remote(host, port):
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.connect((host, port))
 
+    # Line-buffered reader over the socket for everything the server sends
+    sock_file = s.makefile('rb', buffering=65536)
+
     # Receive initial message
-    data = s.recv(1024).decode()
+    data = sock_file.readline().decode()
     print(f"\n[*] Server: {data.strip()}")
 
     # Choose indices 0 and 1
@@ -92,25 +118,16 @@ def solve_remote(host, port):
     print(f"[+] Sending index 2: {idx2}")
     s.sendall(f"{idx2}\n".encode())
 
-    # Receive all outputs at once
+    # Receive the 2019 output lines
     print("\n[*] Receiving outputs...")
-    all_data = b""
-    while True:
-        chunk = s.recv(8192)
-        all_data += chunk
-        # Check if we received all 2019 lines
-        if all_data.count(b'\n') >= 2019:
-            break
-
-    # Parse outputs
-    lines = all_data.decode().strip().split('\n')
+    lines = [sock_file.readline().rstrip(b'\r\n') for _ in range(2019)]
     print(f"[*] Received {len(lines)} lines")
 
     revealed_values = []
-    for i, line in enumerate(lines[:2019]):
-        if line.strip() != 'Nope!':
+    for i, line in enumerate(lines):
+        if line != b'Nope!':
             try:
-                val = int(line.strip())
+                val = int(line)
                 revealed_values.append(val)
                 print(f"[*] Output at index {i}: {val}")
             except ValueError:
@@ -119,6 +136,7 @@ def solve_remote(host, port):
     if len(revealed_values) != 2:
         print(f"[-] Error: Expected 2 values, got {len(revealed_values)}")
         print(f"[-] First few lines: {lines[:10]}")
+        sock_file.close()
         s.close()
         return
 
@@ -151,6 +169,7 @@ def solve_remote(host, port):
 
     if found_seed is None:
         print("[-] Could not find seed in range!")
+        sock_file.close()
         s.close()
         return
 
@@ -166,13 +185,14 @@ def solve_remote(host, port):
 
     # Receive response (flag)
     print("\n[*] Waiting for response...")
-    response = s.recv(4096).decode()
+    response = sock_file.read1(4096).decode()
 
     print("\n" + "="*60)
     print("SERVER RESPONSE:")
     print("="*60)
     print(response)
 
+    sock_file.close()
     s.close()
 
 if __name__ == '__main__':
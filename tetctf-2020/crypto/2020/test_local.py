@@ -4,9 +4,79 @@ Test the solution locally without pwntools
 Simulates the challenge and solves it
 """
 
+import os
 import random
 import subprocess
 import sys
+from multiprocessing import Event, Pool
+
+from mt_untemper import matches_two_stage, untemper
+# Numba seed-scan kernel (prange over init_by_array + partial twist)
+from fast_solve import HAS_NUMBA, HAS_NUMPY
+if HAS_NUMBA:
+    from fast_solve import brute_chunk
+if HAS_NUMPY:
+    import numpy as np
+    from fast_solve import seed_words
+
+N = 624
+
+# Seed tables live next to this script, one file per output index
+SEED_TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def seed_table_path(idx):
+    return os.path.join(SEED_TABLE_DIR, f'seedtable_{idx}.npz')
+
+def cached_seed_table(max_seed, path, idx):
+    """The table cached in path if it was built for output idx and covers max_seed seeds, else None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            if int(data['idx']) != idx or len(data['words']) < max_seed:
+                return None
+            return data['words'][:max_seed]
+    except (OSError, KeyError, ValueError):
+        # Not a table written by build_seed_table
+        return None
+
+def build_seed_table(max_seed, path=None, idx=0):
+    """Untempered output idx (< 624) of every seed below max_seed, indexed by seed
+
+    Built once with the seed kernel (4 bytes per seed) and cached in path
+    (default seed_table_path(idx)) together with idx; a cached table for
+    the same idx covering max_seed is reused.
+    """
+    path = path or seed_table_path(idx)
+    table = cached_seed_table(max_seed, path, idx)
+    if table is not None:
+        return table
+
+    print(f"[*] Building seed table for output {idx}, {max_seed:,} seeds...")
+    table = seed_words(idx, 0, max_seed)
+    np.savez(path, words=table, idx=idx)
+    return table
+
+# Seeds per pool task, and between two looks at the stop event
+CHUNK = 100000
+
+# Set by the worker that finds the seed; bound once per worker by _init_worker
+_stop = None
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+def _scan_chunk(args):
+    """Scan seeds [a, b) in a pool worker; return the matching seed or None"""
+    a, b, idx1, idx2, val1, val2 = args
+    if _stop.is_set():
+        return None
+    for seed in range(a, b):
+        if matches_two_stage(seed, idx1, idx2, val1, val2):
+            _stop.set()
+            return seed
+    return None
 
 def brute_force_seed(idx1, idx2, val1, val2, max_seed=10000000):
     """Brute force the seed"""
@@ -14,32 +84,60 @@ def brute_force_seed(idx1, idx2, val1, val2, max_seed=10000000):
     print(f"    output[{idx1}] = {val1}")
     print(f"    output[{idx2}] = {val2}")
 
-    for seed in range(max_seed):
-        if seed % 100000 == 0 and seed > 0:
-            print(f"    Progress: {seed:,}/{max_seed:,}")
-
-        random.seed(seed)
-        match = True
-        for i in range(max(idx1, idx2) + 1):
-            r = random.getrandbits(32)
-            if i == idx1 and r != val1:
-                match = False
-                break
-            if i == idx2 and r != val2:
-                match = False
-                break
-
-        if match:
-            return seed
+    if HAS_NUMPY and max(idx1, idx2) < N:
+        # Meet in the middle: filter by a table keyed on the earlier output,
+        # confirm the few survivors on the other one. Building the table is
+        # a full scalar scan, slower than one lane-parallel brute_chunk run,
+        # so with Numba only an already cached table is used (see
+        # --build-table); with NumPy alone the build is the fastest scan
+        # available and it is kept for the next query.
+        (lo, val_lo), _ = sorted([(idx1, val1), (idx2, val2)])
+        table = cached_seed_table(max_seed, seed_table_path(lo), lo)
+        if table is None and not HAS_NUMBA:
+            table = build_seed_table(max_seed, idx=lo)
+        if table is not None:
+            for seed in np.flatnonzero(table == untemper(val_lo)):
+                if matches_two_stage(int(seed), idx1, idx2, val1, val2):
+                    return int(seed)
+            return None
+
+    if HAS_NUMBA and max(idx1, idx2) < N:
+        (lo, val_lo), (hi, val_hi) = sorted([(idx1, val1), (idx2, val2)])
+        seed = brute_chunk(0, max_seed, lo, untemper(val_lo), hi, untemper(val_hi))
+        return seed if seed >= 0 else None
+
+    chunks = [(a, min(a + CHUNK, max_seed), idx1, idx2, val1, val2)
+              for a in range(0, max_seed, CHUNK)]
+    with Pool(os.cpu_count(), initializer=_init_worker, initargs=(Event(),)) as pool:
+        for done, seed in enumerate(pool.imap_unordered(_scan_chunk, chunks), 1):
+            if seed is not None:
+                return seed
+            print(f"    Progress: {done}/{len(chunks)} chunks")
 
     return None
 
 def predict_2020th(seed):
-    """Predict the 2020th number"""
-    random.seed(seed)
-    for i in range(2020):
-        result = random.getrandbits(32)
-    return result
+    """Predict the 2020th number (outputs 0..2018 skipped in one call)
+
+    The skip is 2019 genrand steps in C (~12 us, about 4 twists), so a
+    characteristic-polynomial jump-ahead, which does ~19937 state-sized
+    GF(2) additions, only pays off for jumps far beyond one block.
+    """
+    rng = random.Random(seed)
+    rng.getrandbits(32 * 2019)
+    return rng.getrandbits(32)
+
+def recover_state(outputs):
+    """Clone a generator from 624 consecutive 32-bit outputs
+
+    Untempering output i gives state word i of the current block, so the
+    clone continues exactly where the outputs stop - no seed needed, which
+    also covers the default urandom seeding.
+    """
+    state = tuple(untemper(y) for y in outputs[:N])
+    rng = random.Random()
+    rng.setstate((3, state + (N,), None))
+    return rng
 
 def simulate_challenge():
     """Simulate the challenge locally"""
@@ -56,20 +154,21 @@ def simulate_challenge():
     idx1, idx2 = 0, 1
     print(f"\n[+] Choosing indices: {idx1} and {idx2}")
 
-    # Simulate the challenge generating numbers
-    random.seed(actual_seed)
-    outputs = []
+    # Simulate the challenge generating numbers: only the revealed outputs
+    # are materialized, the rest are skipped with getrandbits(32*k)
+    rng = random.Random(actual_seed)
     revealed = []
-
-    for i in range(2019):
-        r = random.getrandbits(32)
-        outputs.append(r)
-        if i == idx1 or i == idx2:
-            revealed.append(r)
-            print(f"[*] Output at index {i}: {r}")
+    pos = 0
+    for i in sorted({idx1, idx2}):
+        rng.getrandbits(32 * (i - pos))
+        r = rng.getrandbits(32)
+        pos = i + 1
+        revealed.append(r)
+        print(f"[*] Output at index {i}: {r}")
 
     # Generate the 2020th number (target)
-    target_2020 = random.getrandbits(32)
+    rng.getrandbits(32 * (2019 - pos))
+    target_2020 = rng.getrandbits(32)
     print(f"\n[*] Target 2020th number: {target_2020} (hidden)")
 
     # Now solve it
@@ -105,6 +204,33 @@ def simulate_challenge():
         print("\n[-] FAILED! Prediction doesn't match")
         return False
 
+def simulate_state_recovery():
+    """Variant where outputs 0..623 are all revealed: clone the state instead of searching seeds
+
+    The real challenge only reveals two indices, so this does not replace
+    the seed search there; it shows the unseeded (os.urandom) case.
+    """
+    print("\n" + "="*60)
+    print("State recovery from 624 outputs")
+    print("="*60)
+
+    challenge = random.Random()
+    outputs = [challenge.getrandbits(32) for _ in range(N)]
+    challenge.getrandbits(32 * (2019 - N))
+    target_2020 = challenge.getrandbits(32)
+
+    rng = recover_state(outputs)
+    rng.getrandbits(32 * (2019 - N))
+    prediction = rng.getrandbits(32)
+    print(f"[+] Predicted 2020th number: {prediction}")
+    print(f"[+] Actual 2020th number: {target_2020}")
+    return prediction == target_2020
+
 if __name__ == '__main__':
-    success = simulate_challenge()
+    if '--build-table' in sys.argv[1:]:
+        # Output 0 over the simulation's seed range, for brute_force_seed's lookup
+        build_seed_table(2000000)
+        sys.exit(0)
+
+    success = simulate_challenge() and simulate_state_recovery()
     sys.exit(0 if success else 1)